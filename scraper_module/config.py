@@ -3,7 +3,8 @@ config.py
 
 Provides configuration loading functionality for the scraper tool.
 
-This module attempts to load the configuration from `~/.scraper/scraper.conf`:
+This module loads the configuration from `~/.scraper/scraper.conf` the first
+time one of its settings is accessed (e.g. `config.DB_NAME`):
 - Reads the JOB_SCRAPER_URL from the configuration.
 - Raises an error if the configuration file or necessary keys are missing.
 
@@ -19,45 +20,68 @@ import configparser
 import os
 from .auth_method import AuthMethod
 
-config = configparser.ConfigParser(interpolation=None)
 config_path = os.path.expanduser("~/.scraper/scraper.conf")
 
-if os.path.exists(config_path):
-    config.read(config_path)
+# Settings read from the configuration file, filled on first access
+_settings = {}
+
 
+def load_config():
+    """
+    Reads the configuration file and returns its settings as a dictionary.
+    """
+    if not os.path.exists(config_path):
+        raise ValueError(f"Configuration file not found at {config_path}")
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(config_path)
+    settings = {}
 
     # Reading the DEFAULT section
     if "URL" in config["DEFAULT"]:
-        JOB_SCRAPER_DEFAULT_URL = config["DEFAULT"]["URL"]
+        settings["JOB_SCRAPER_DEFAULT_URL"] = config["DEFAULT"]["URL"]
     else:
         raise ValueError("URL key not found in the configuration file!")
-    
+
     # Reading the REMOTE section
     if "URL" in config["REMOTE"]:
-        JOB_SCRAPER_REMOTE_URL = config["REMOTE"]["URL"]
+        settings["JOB_SCRAPER_REMOTE_URL"] = config["REMOTE"]["URL"]
     else:
         raise ValueError("URL key not found in the REMOTE section of the configuration file!")
 
     # Reading the DATABASE section
     if "DATABASE" in config:
-        DB_NAME = config["DATABASE"].get("DB_NAME")
-        if DB_NAME is None:
+        settings["DB_NAME"] = config["DATABASE"].get("DB_NAME")
+        if settings["DB_NAME"] is None:
             raise ValueError("DB_NAME is required but not found in DATABASE configuration!")
 
-        DB_USER = config["DATABASE"].get("DB_USER")  # Will be None if not present
-        DB_PASSWORD = config["DATABASE"].get("DB_PASSWORD")  # Will be None if not present
-        DB_HOST = config["DATABASE"].get("DB_HOST", "localhost")
-        DB_PORT = config["DATABASE"].get("DB_PORT", "1433")  # Updated default port for SQL Server
-        
+        settings["DB_USER"] = config["DATABASE"].get("DB_USER")  # Will be None if not present
+        settings["DB_PASSWORD"] = config["DATABASE"].get("DB_PASSWORD")  # Will be None if not present
+        settings["DB_HOST"] = config["DATABASE"].get("DB_HOST", "localhost")
+        settings["DB_PORT"] = config["DATABASE"].get("DB_PORT", "1433")  # Updated default port for SQL Server
+
         # New configuration for authentication method
         auth_method_str = config["DATABASE"].get("AUTH_METHOD", "WINDOWS_AUTH")
         if auth_method_str == "WINDOWS_AUTH":
-            AUTH_METHOD = AuthMethod.WINDOWS_AUTH
+            settings["AUTH_METHOD"] = AuthMethod.WINDOWS_AUTH
         elif auth_method_str == "SQL_SERVER_AUTH":
-            AUTH_METHOD = AuthMethod.SQL_SERVER_AUTH
+            settings["AUTH_METHOD"] = AuthMethod.SQL_SERVER_AUTH
 
     else:
         raise ValueError("DATABASE section not found in the configuration file!")
 
-else:
-    raise ValueError(f"Configuration file not found at {config_path}")
+    return settings
+
+
+def __getattr__(name):
+    """
+    Loads the configuration on first access to one of its settings. Private
+    names are never settings, so probing them does not load the file.
+    """
+    if name.startswith("_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if not _settings:
+        _settings.update(load_config())
+    if name in _settings:
+        return _settings[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
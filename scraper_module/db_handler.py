@@ -83,20 +83,69 @@ class DBHandler:
             raise ValueError("Invalid authentication method or credentials")
         return self.conn
 
-    def execute(self, query, params=None):
-        """Execute a SQL query."""
-        with self.conn.cursor() as cur:
+    # The cursors below are closed explicitly rather than used as context
+    # managers, because pyodbc commits when a cursor's `with` block exits.
+
+    def execute(self, query, params=None, commit=True):
+        """Execute a SQL query, committing it unless `commit` is False."""
+        cur = self.conn.cursor()
+        try:
             if params is not None:
                 cur.execute(query, params)
             else:
                 cur.execute(query)
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
+        finally:
+            cur.close()
+
+    def executemany(self, query, params_seq, commit=True):
+        """
+        Execute a SQL query once for each set of parameters, committing unless
+        `commit` is False.
+        """
+        cur = self.conn.cursor()
+        try:
+            cur.executemany(query, params_seq)
+            if commit:
+                self.conn.commit()
+        finally:
+            cur.close()
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.conn.commit()
+
+    def rollback(self):
+        """Roll back the current transaction."""
+        self.conn.rollback()
 
     def fetch(self, query, params=None):
         """Fetch results from a SQL query."""
-        with self.conn.cursor() as cur:
-            cur.execute(query, params)
+        cur = self.conn.cursor()
+        try:
+            if params is not None:
+                cur.execute(query, params)
+            else:
+                cur.execute(query)
             return cur.fetchall()
+        finally:
+            cur.close()
+
+    def fetch_iter(self, query, params=None, batch_size=1000):
+        """Yield results from a SQL query, fetching `batch_size` rows at a time."""
+        cur = self.conn.cursor()
+        try:
+            if params is not None:
+                cur.execute(query, params)
+            else:
+                cur.execute(query)
+            rows = cur.fetchmany(batch_size)
+            while rows:
+                yield from rows
+                rows = cur.fetchmany(batch_size)
+        finally:
+            cur.close()
 
     def close(self):
         """Close the database connection."""
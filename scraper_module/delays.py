@@ -3,17 +3,27 @@ delays.py
 ---------
 
 This module defines the delay constants for network handling and
-determines the number of retries for requests.
+determines the number of retries for requests and the number of pages
+fetched concurrently.
 """
-from enum import Enum
+from enum import IntEnum
 
-class DelaySettings(Enum):
+class DelaySettings(IntEnum):
     """
-    Delay constants for network handling
+    Delay constants for network handling. Members are integers, so they can
+    be used directly without `.value`.
     """
 
-    SELENIUM_INTERACTION_DELAY = 10
     SUCCESSIVE_URL_READ_DELAY = 20
-    REQUEST_EXCEPTION_DELAY = 30
+    MIN_URL_READ_DELAY = 5
+    MAX_URL_READ_DELAY = 120
+    REQUEST_EXCEPTION_BASE_DELAY = 2
+    REQUEST_EXCEPTION_DELAY = 30  # Maximum delay between retries
     REQUEST_TIMEOUT = 10
     NUM_RETRIES = 4
+
+
+# Counts rather than delays, kept out of DelaySettings so that they don't
+# become aliases of enum members with the same value
+NUM_FETCH_WORKERS = 4  # Pages fetched concurrently
+URL_READ_DELAY_DECREASE_AFTER = 5  # Successful reads before shrinking the delay
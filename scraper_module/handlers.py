@@ -3,19 +3,24 @@ handlers.py
 
 This module defines structures and utilities for web access and page scraping:
 
-- `NetworkHandler`: Manages web interactions using Selenium and requests, with
-  appropriate delays set by `DelaySettings` to avoid request rate limits or bans.
+- `NetworkHandler`: Manages web interactions using Selenium and a pooled
+  requests session, with appropriate delays set by `DelaySettings` to avoid
+  request rate limits or bans.
 
 Examples:
     >>> handler = NetworkHandler('https://url.for.job.search/jobs)
-    >>> links = handler.find_job_links()
+    >>> urls = handler.find_job_urls()
     >>> soup = handler.get_soup('https://url.for.job.search/job/123')
+    >>> soups = handler.get_soups(['https://url.for.job.search/job/123'])
 
 Note: Always handle web scraping responsibly, respecting robots.txt and website
 policies.
 """
 
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
@@ -28,9 +33,31 @@ from selenium.common.exceptions import (
     TimeoutException,
 )
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
-from .delays import DelaySettings
+from .delays import (
+    DelaySettings,
+    NUM_FETCH_WORKERS,
+    URL_READ_DELAY_DECREASE_AFTER,
+)
+
+HEADLESS_BROWSER = True  # Set to False to watch the browser while scraping
+
+# Locators for the job links and the "Next" page link of the search results
+JOB_LINK_LOCATOR = (By.XPATH, '//a[contains(@href, "/job/")]')
+NEXT_BUTTON_LOCATOR = (
+    By.XPATH,
+    '//a[starts-with(@data-automation, "page-") and @aria-label="Next"]',
+)
+
+# Returns the URLs of all job links on the page in one WebDriver round-trip
+JOB_URLS_SCRIPT = """
+return Array.from(
+    document.querySelectorAll('a[href*="/job/"]'), (link) => link.href
+);
+"""
 
 
 class NetworkHandler:
@@ -43,63 +70,112 @@ class NetworkHandler:
         """
         Initialize a handler, set up the Selenium driver and open the URL.
         """
-        self.successive_url_read_delay = DelaySettings.SUCCESSIVE_URL_READ_DELAY.value
-        self.last_request_time = 0
-        self.time_since_last_request = 0
-        self.driver = webdriver.Chrome()
+        self.successive_url_read_delay = DelaySettings.SUCCESSIVE_URL_READ_DELAY
+        self.next_request_time = 0.0  # Earliest time.monotonic() for the next read
+        # Delay between URL reads, adapted to the server's responses
+        self.url_read_delay = DelaySettings.SUCCESSIVE_URL_READ_DELAY
+        self.consecutive_successful_reads = 0
+        self.request_lock = threading.Lock()
+        # Set to stop fetch workers that are waiting for their turn to read
+        self.stop_event = threading.Event()
+        # Reuse connections across requests, one per concurrent fetch worker.
+        # Gateway errors are retried with backoff; connection errors are
+        # retried by get_request(). Rate limiting (429) is not retried here, it
+        # is handled by adjust_url_read_delay().
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=NUM_FETCH_WORKERS,
+            max_retries=Retry(
+                total=DelaySettings.NUM_RETRIES,
+                connect=0,
+                read=0,
+                backoff_factor=1,
+                status_forcelist=(502, 503),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.driver = webdriver.Chrome(options=self.chrome_options())
         self.wait = WebDriverWait(self.driver, self.successive_url_read_delay)
         print(f"Opening {url}")
         self.driver.get(url)
 
-    def selenium_interaction_delay(self):
+    @staticmethod
+    def chrome_options():
         """
-        Delay for Selenium interactions to allow the browser to react.
+        Return Chrome options that skip work the scraper does not need, such
+        as loading images, GPU compositing and extensions.
         """
-        time.sleep(DelaySettings.SELENIUM_INTERACTION_DELAY.value)
+        options = webdriver.ChromeOptions()
+        if HEADLESS_BROWSER:
+            options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        return options
 
-    def find_elements(self, by, value):  # pylint: disable=invalid-name
+    def find_job_urls(self):
         """
-        Find and return web elements based on the provided criteria.
+        Find and return the URLs of the job links on the current page, reading
+        all of them in a single WebDriver round-trip once the links are present.
+        Returns an empty list on timeout.
         """
-        elements = self.driver.find_elements(by, value)
-        self.selenium_interaction_delay()
-        return elements
+        try:
+            self.wait.until(EC.presence_of_element_located(JOB_LINK_LOCATOR))
+        except TimeoutException:
+            return []
+        return self.driver.execute_script(JOB_URLS_SCRIPT)
 
-    def find_job_links(self):
+    def initiate_search(self, search_term):
         """
-        Find and return job links on the current page.
+        Initiate a search using the given search term and wait until the
+        results of any previous search have been replaced.
+        Raises TimeoutException if they are not replaced, rather than reading
+        the previous search's results as this one's.
         """
-        xpath_expression = '//a[contains(@href, "/job/")]'
-        return self.find_elements(By.XPATH, xpath_expression)
+        previous_job_urls = self.driver.execute_script(JOB_URLS_SCRIPT)
+        search_field = self.driver.find_element(By.ID, "keywords-input")
+        # Select all, release CONTROL (NULL), clear, type and submit in one
+        # WebDriver command
+        search_field.send_keys(
+            Keys.CONTROL, "a", Keys.NULL, Keys.DELETE, search_term, Keys.RETURN
+        )
+        if previous_job_urls:
+            self.wait_for_job_urls_to_change(previous_job_urls)
 
-    def initiate_search(self, search_term):
+    def wait_for_job_urls_to_change(self, previous_job_urls):
         """
-        Initiate a search using the given search term.
+        Wait until the URLs of the job links on the page differ from
+        `previous_job_urls`, i.e. the previous results have been replaced.
+        Raises TimeoutException if they have not changed in time.
         """
-        search_field = self.driver.find_element(By.ID, "keywords-input")
-        search_field.send_keys(Keys.CONTROL + "a")
-        search_field.send_keys(Keys.DELETE)
-        search_field.send_keys(search_term)
-        search_field.send_keys(Keys.RETURN)
-        self.selenium_interaction_delay()  # Add the delay after initiating the search
+        previous_job_urls = set(previous_job_urls)
+        self.wait.until(
+            lambda driver: set(driver.execute_script(JOB_URLS_SCRIPT))
+            != previous_job_urls,
+            "The job links on the page were not replaced",
+        )
 
     def click_next_button(self):
         """
-        Click the next button on a page, if available.
-        Returns True if successful, False otherwise.
+        Click the next button on a page, if available, and wait until the
+        current job links have been replaced.
+        Returns True if the button was clicked, False otherwise.
+        Raises TimeoutException if the job links are not replaced after the
+        click, rather than reading the same page again.
         """
         try:
+            # Raises NoSuchElementException if there are no results to page through
+            self.driver.find_element(*JOB_LINK_LOCATOR)
+            previous_job_urls = self.driver.execute_script(JOB_URLS_SCRIPT)
             next_button = self.wait.until(
-                EC.presence_of_element_located(
-                    (
-                        By.XPATH,
-                        '//a[starts-with(@data-automation, "page-") and @aria-label="Next"]',
-                    )
-                )
+                EC.presence_of_element_located(NEXT_BUTTON_LOCATOR)
             )
             next_button.click()
-            self.selenium_interaction_delay()
-            return True  # Successfully clicked the button
 
         except (
             ElementClickInterceptedException,
@@ -110,51 +186,134 @@ class NetworkHandler:
                 False  # Failed to click the button because of one of these exceptions
             )
 
+        self.wait_for_job_urls_to_change(previous_job_urls)
+        return True  # Successfully clicked the button
+
     def handle_successive_url_read_delay(self):
         """
-        Implement a delay between successive URL reads based on `DelaySettings`.
+        Implement a delay between the starts of successive URL reads, starting
+        from `DelaySettings` and adapted by `adjust_url_read_delay`, plus some
+        jitter. The lock spaces out requests made from concurrent fetch workers,
+        but is not held while waiting, so that `adjust_url_read_delay` can push
+        back the next read while workers wait for it.
+        Raises RuntimeError if the fetches are stopped while waiting.
         """
-        self.time_since_last_request = time.time() - self.last_request_time
-        if self.time_since_last_request < DelaySettings.SUCCESSIVE_URL_READ_DELAY.value:
-            time.sleep(
-                DelaySettings.SUCCESSIVE_URL_READ_DELAY.value
-                - self.time_since_last_request
-            )
-        self.last_request_time = time.time()
+        while True:
+            with self.request_lock:
+                if self.stop_event.is_set():
+                    raise RuntimeError("URL reads were stopped")
+                now = time.monotonic()
+                if now >= self.next_request_time:
+                    self.next_request_time = (
+                        now + self.url_read_delay + random.uniform(0, 1)
+                    )
+                    return
+                wait_time = self.next_request_time - now
+            self.stop_event.wait(wait_time)
+
+    def adjust_url_read_delay(self, status_code):
+        """
+        Double the delay between URL reads when the server is rate limiting
+        or refusing requests, and shrink it gradually after a run of
+        successful reads, within the `DelaySettings` bounds.
+        A doubled delay also applies to the next read, which has already been
+        scheduled with the previous delay.
+        """
+        with self.request_lock:
+            if status_code in (403, 429):
+                self.consecutive_successful_reads = 0
+                previous_delay = self.url_read_delay
+                self.url_read_delay = min(
+                    self.url_read_delay * 2, DelaySettings.MAX_URL_READ_DELAY
+                )
+                self.next_request_time += self.url_read_delay - previous_delay
+            elif status_code == 200:
+                self.consecutive_successful_reads += 1
+                if (
+                    self.consecutive_successful_reads
+                    >= URL_READ_DELAY_DECREASE_AFTER
+                ):
+                    self.consecutive_successful_reads = 0
+                    self.url_read_delay = max(
+                        self.url_read_delay * 0.8,
+                        DelaySettings.MIN_URL_READ_DELAY,
+                    )
 
     def get_request(self, url):
         """
         Perform an HTTP GET request for the given URL.
-        Retries on exception based on `DelaySettings`.
+        Retries on exception based on `DelaySettings`, with a capped exponential
+        backoff plus jitter between attempts. The first timeout is retried
+        immediately.
         """
         last_exception = None
-        for _ in range(DelaySettings.NUM_RETRIES.value):
+        retried_timeout = False
+        for attempt in range(DelaySettings.NUM_RETRIES):
             try:
-                request = requests.get(url, timeout=DelaySettings.REQUEST_TIMEOUT.value)
-                self.last_request_time = time.time()
-                return request
+                return self.session.get(
+                    url, timeout=DelaySettings.REQUEST_TIMEOUT
+                )
             except requests.RequestException as exception:
                 last_exception = exception
                 print("E", end="")
-                time.sleep(DelaySettings.REQUEST_EXCEPTION_DELAY.value)
+                if attempt == DelaySettings.NUM_RETRIES - 1:
+                    break
+                if isinstance(exception, requests.Timeout) and not retried_timeout:
+                    retried_timeout = True
+                    continue
+                base_delay = DelaySettings.REQUEST_EXCEPTION_BASE_DELAY
+                time.sleep(
+                    min(DelaySettings.REQUEST_EXCEPTION_DELAY, base_delay * 2**attempt)
+                    + random.uniform(0, base_delay)
+                )
         raise last_exception
 
     def get_soup(self, url):
         """
-        Return a BeautifulSoup object for the given URL.
-        Implements a delay if needed based on the last request time.
+        Return a BeautifulSoup object for the given URL, or None if the server
+        did not return the page (e.g. when rate limiting).
+        Implements a delay if needed based on the next allowed request time.
         """
         self.handle_successive_url_read_delay()
         response = self.get_request(url)
+        self.adjust_url_read_delay(response.status_code)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = BeautifulSoup(response.content, "lxml")
         else:
             soup = None
-        self.last_request_time = time.time()  # Set time since last request
         return soup
 
+    def get_soups(self, urls):
+        """
+        Return a dictionary of BeautifulSoup objects keyed by URL, fetching the
+        pages concurrently. URLs whose page the server did not return, or that
+        failed to download after the retries in `get_request`, map to None.
+        On an interrupt the queued fetches are cancelled instead of being
+        waited for.
+        """
+        soups = {}
+        self.stop_event.clear()
+        executor = ThreadPoolExecutor(max_workers=NUM_FETCH_WORKERS)
+        try:
+            futures = {
+                executor.submit(self.get_soup, url): url for url in dict.fromkeys(urls)
+            }
+            for future in as_completed(futures):
+                try:
+                    soups[futures[future]] = future.result()
+                except requests.RequestException:
+                    # get_request() has already retried the download
+                    soups[futures[future]] = None
+        except BaseException:
+            self.stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        return soups
+
     def close(self):
         """
-        Close the Selenium browser window.
+        Close the Selenium browser window and the HTTP session.
         """
+        self.session.close()
         self.driver.quit()
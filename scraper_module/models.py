@@ -27,7 +27,7 @@ import os
 from enum import Enum, auto
 from datetime import datetime, timedelta
 from .db_handler import DBHandler
-from .config import DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, AUTH_METHOD
+from . import config
 from .queries import SQLQueries
 
 
@@ -57,48 +57,82 @@ class JobData:
         Also, initializes the job data by reading existing CSV files.
         """
         # Initialize DB connection
-        self.db_handler = DBHandler(dbname=DB_NAME, auth_method=AUTH_METHOD, user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT)
+        self.db_handler = DBHandler(dbname=config.DB_NAME, auth_method=config.AUTH_METHOD, user=config.DB_USER, password=config.DB_PASSWORD, host=config.DB_HOST, port=config.DB_PORT)
         self.db_handler.connect()
 
         # Ensure the required table exists
         self.create_tables_if_not_exists()
 
-        # Store the initial counts
-        self.initial_counts = {
-            LinkStatus.VALID: self.get_link_count(LinkStatus.VALID),
-            LinkStatus.INVALID: self.get_link_count(LinkStatus.INVALID),
+        # Load every known (job_number, search_term) validity in one query so that
+        # link processing does not need a database round-trip per scraped link
+        self.search_term_validities = self.load_search_term_validities()
+
+        # Links waiting to be written to the database by flush_links()
+        self.pending_links = []
+
+        # Count the links once, then keep the counts up to date as links are added
+        self.link_counts = {
+            LinkStatus.VALID: self.count_links(LinkStatus.VALID),
+            LinkStatus.INVALID: self.count_links(LinkStatus.INVALID),
         }
 
-        print(f"Initial Validated links #{self.get_link_count(LinkStatus.VALID)}")
-        print(f"Initial Invalidated links #{self.get_link_count(LinkStatus.INVALID)}")
+        # Store the initial counts
+        self.initial_counts = dict(self.link_counts)
+
+        print(f"Initial Validated links #{self.initial_counts[LinkStatus.VALID]}")
+        print(f"Initial Invalidated links #{self.initial_counts[LinkStatus.INVALID]}")
 
     def extract_job_number_from_url(self, url):
         """
         Extracts the job number from the provided URL by looking for the characters
-        after the last forward slash.
+        after the last forward slash. Numeric job numbers are returned as integers,
+        matching the `job_number` column of the jobs table.
         """
-        return url.split("/")[-1]
+        job_number = url.rpartition("/")[2]
+        try:
+            return int(job_number)
+        except ValueError:
+            return job_number
 
 
 
     def create_tables_if_not_exists(self):
         """
-        Creates the required tables if they do not exist.
+        Creates the required tables and indexes if they do not exist.
         """
-        self.db_handler.execute(SQLQueries.CREATE_JOBS_TABLE_QUERY)
-        self.db_handler.execute(SQLQueries.CREATE_SEARCH_TERMS_TABLE_QUERY)
-        self.db_handler.execute(SQLQueries.CREATE_JOB_SEARCH_TERMS_TABLE_QUERY)
+        self.db_handler.execute(SQLQueries.CREATE_TABLES_QUERY)
 
 
-    def get_link_count(self, status: LinkStatus) -> int:
+    def load_search_term_validities(self):
         """
-        Return the current count of links for a provided status.
+        Loads the search terms and validities of every job in the database.
+
+        Returns:
+        - dict: A dictionary mapping job numbers (as integers) to a dictionary of
+          search terms and their corresponding validities (as booleans).
+        """
+        validities = {}
+        for job_number, term_text, valid in self.db_handler.fetch_iter(SQLQueries.GET_ALL_SEARCH_TERM_VALIDITIES):
+            validities.setdefault(job_number, {})[term_text] = bool(valid)
+        return validities
+
+    def count_links(self, status: LinkStatus) -> int:
+        """
+        Counts the links for a provided status, i.e. the number of jobs with at
+        least one search term of that validity.
         """
         is_valid = (status == LinkStatus.VALID)
         
-        result = self.db_handler.fetch(SQLQueries.GET_DISTINCT_JOBS_QUERY, (is_valid,))
-        
-        return result[0][0]
+        return sum(
+            is_valid in validities.values()
+            for validities in self.search_term_validities.values()
+        )
+
+    def get_link_count(self, status: LinkStatus) -> int:
+        """
+        Return the current count of links for a provided status.
+        """
+        return self.link_counts[status]
 
 
     def get_links_difference(self, status: LinkStatus) -> int:
@@ -112,45 +146,68 @@ class JobData:
         """
         Checks if a job is present in the database and its validity status.
         Returns a dictionary indicating the presence of the job and its validity.
+        A job is valid if it is valid for any of its search terms.
         """
         
-        result = self.db_handler.fetch(SQLQueries.JOB_IN_LINKS_QUERY, (job_number,))
+        validities = self.search_term_validities.get(job_number)
         
-        if not result:
+        if not validities:
             return {LinkStatus.VALID: False, LinkStatus.INVALID: False}
         
-        is_valid = result[0][0]
+        is_valid = any(validities.values())
         return {LinkStatus.VALID: is_valid, LinkStatus.INVALID: not is_valid}
 
 
     def add_or_update_link(self, search_term, url, job_number, job_date, status: LinkStatus):
         """
-        Adds a new job link to the database, categorized by the provided status.
+        Queues a job link to be added to the database, categorized by the provided status.
+        Queued links are written by `flush_links`.
         """
         is_valid = (status == LinkStatus.VALID)
 
-        # Insert the job if it doesn't exist
-        self.db_handler.execute(SQLQueries.INSERT_JOB_IF_NOT_EXISTS_QUERY, (job_number, job_number, url))
-
-        # Update the job_date
-        self.db_handler.execute(SQLQueries.UPDATE_JOB_DATE, (job_date, job_number))
-
-
-        # Insert the search term if it doesn't exist
-        
-        self.db_handler.execute(SQLQueries.SEARCH_TERM_INSERT_QUERY, (search_term, search_term))
+        self.pending_links.append((search_term, url, job_number, job_date, is_valid))
 
+    def record_link_validity(self, search_term, job_number, is_valid):
+        """
+        Records a saved link's validity in the in-memory validities and keeps
+        the link counts up to date.
+        """
+        validities = self.search_term_validities.setdefault(job_number, {})
+        was_valid, was_invalid = True in validities.values(), False in validities.values()
+        validities[search_term] = is_valid
+        self.link_counts[LinkStatus.VALID] += (True in validities.values()) - was_valid
+        self.link_counts[LinkStatus.INVALID] += (False in validities.values()) - was_invalid
 
-        # Fetch the job_id and term_id
-        
-        job_id = self.db_handler.fetch(SQLQueries.JOB_ID_QUERY, (job_number,))[0][0]
-        term_id = self.db_handler.fetch(SQLQueries.TERM_ID_QUERY, (search_term,))[0][0]
+    def flush_links(self):
+        """
+        Writes all queued job links to the database in a single transaction.
+        If the write fails, the transaction is rolled back and the links are
+        discarded, so the in-memory validities still match the database.
+        """
+        if not self.pending_links:
+            return
 
-        # Insert/Update the association between job and search term with validity
-        
-        self.db_handler.execute(SQLQueries.UPSERT_JOB_SEARCH_TERM_VALIDITY, (job_id, term_id, is_valid, is_valid))
+        links, self.pending_links = self.pending_links, []
+        try:
+            # Save each link, and its job and search term, in one round-trip per link
+            self.db_handler.executemany(
+                SQLQueries.SAVE_LINK_QUERY,
+                [
+                    (job_number, url, job_date, search_term, is_valid)
+                    for search_term, url, job_number, job_date, is_valid in links
+                ],
+                commit=False,
+            )
 
+            # Commit all of the above in a single transaction
+            self.db_handler.commit()
+        except Exception:
+            self.db_handler.rollback()
+            raise
 
+        # Keep the in-memory validities and link counts in sync with the database
+        for search_term, _, job_number, _, is_valid in links:
+            self.record_link_validity(search_term, job_number, is_valid)
 
 
 
@@ -167,32 +224,14 @@ class JobData:
         For a given job_number, retrieve the associated search terms and their validities.
 
         Parameters:
-        - job_number (str): The job number to look up.
+        - job_number (int): The job number to look up.
 
         Returns:
         - dict: A dictionary where keys are search terms and values are their corresponding validities (as booleans).
         """
 
-        # Query to get the job_id for the given job_number
-        
-        results = self.db_handler.fetch(SQLQueries.JOB_ID_QUERY, (job_number,))
-        job_id_result = results[0] if results else None
-
-        # If no job is found with the given job_number, return an empty dictionary
-        if not job_id_result:
-            return {}
-
-        job_id = job_id_result[0]
+        return self.search_term_validities.get(job_number, {})
 
-        # Query to get the search terms and their validities for the given job_id
-        
-        results = self.db_handler.fetch(SQLQueries.GET_SEARCH_TERM_VALIDITIES_FROM_JOB, (job_id,))
-
-        # Convert the results into a dictionary: search_term -> validity
-        validities = {row[0]: row[1] for row in results}
-
-        return validities
-   
     def calculate_job_date(self, job_age):
         """
         Calculates the age of the job by
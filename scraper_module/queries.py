@@ -21,6 +21,14 @@ class SQLQueries:
             END
             """
 
+    # Index for looking up jobs by job_number
+    CREATE_JOBS_JOB_NUMBER_INDEX_QUERY = """
+            IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = N'ix_jobs_job_number' AND object_id = OBJECT_ID(N'dbo.jobs'))
+            BEGIN
+            CREATE INDEX ix_jobs_job_number ON dbo.jobs (job_number);
+            END
+            """
+
     # Table for search terms
     CREATE_SEARCH_TERMS_TABLE_QUERY = """
             IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = N'search_terms' AND type = 'U')
@@ -48,55 +56,56 @@ class SQLQueries:
             END
             """
 
-    GET_DISTINCT_JOBS_QUERY = """
-            SELECT COUNT(DISTINCT job_id) 
-            FROM job_search_terms 
-            WHERE valid = ?;
-            """
+    # All of the tables and indexes above, created in a single batch
+    CREATE_TABLES_QUERY = (
+        CREATE_JOBS_TABLE_QUERY
+        + CREATE_JOBS_JOB_NUMBER_INDEX_QUERY
+        + CREATE_SEARCH_TERMS_TABLE_QUERY
+        + CREATE_JOB_SEARCH_TERMS_TABLE_QUERY
+    )
 
-    JOB_IN_LINKS_QUERY = """
-            SELECT valid FROM jobs WHERE job_number = ?;
-            """
+    # Saves one link in a single round-trip: inserts the job and search term if
+    # they don't exist, then updates the job_date and the link's validity only
+    # when they have changed
+    SAVE_LINK_QUERY = """
+            SET NOCOUNT ON;
+            DECLARE @job_number INT = ?, @job_url NVARCHAR(MAX) = ?, @job_date DATE = ?,
+                    @term_text NVARCHAR(MAX) = ?, @valid BIT = ?;
 
-    INSERT_JOB_IF_NOT_EXISTS_QUERY = """
-            IF NOT EXISTS (SELECT 1 FROM jobs WHERE job_number = ?)
+            IF NOT EXISTS (SELECT 1 FROM jobs WHERE job_number = @job_number)
             BEGIN
-                INSERT INTO jobs (job_number, job_url) 
-                VALUES (?, ?);
+                INSERT INTO jobs (job_number, job_url)
+                VALUES (@job_number, @job_url);
             END
-            """
-    UPDATE_JOB_DATE = """
+
             UPDATE jobs
-            SET job_date = ?
-            WHERE job_number = ?;
-            """
+            SET job_date = @job_date
+            WHERE job_number = @job_number
+            AND EXISTS (SELECT job_date EXCEPT SELECT @job_date);
 
-    SEARCH_TERM_INSERT_QUERY = """
-            IF NOT EXISTS (SELECT 1 FROM search_terms WHERE term_text = ?)
+            IF NOT EXISTS (SELECT 1 FROM search_terms WHERE term_text = @term_text)
             BEGIN
-                INSERT INTO search_terms (term_text) 
-                VALUES (?);
+                INSERT INTO search_terms (term_text)
+                VALUES (@term_text);
             END
-            """
-
-    JOB_ID_QUERY = "SELECT job_id FROM jobs WHERE job_number = ?;"
-
-
-    TERM_ID_QUERY = "SELECT term_id FROM search_terms WHERE term_text = ?;"
 
-    UPSERT_JOB_SEARCH_TERM_VALIDITY = """
             MERGE INTO job_search_terms AS target
-            USING (SELECT ? AS job_id, ? AS term_id) AS source
+            USING (
+                SELECT j.job_id, st.term_id
+                FROM jobs j
+                JOIN search_terms st ON st.term_text = @term_text
+                WHERE j.job_number = @job_number
+            ) AS source
             ON target.job_id = source.job_id AND target.term_id = source.term_id
-            WHEN MATCHED THEN 
-                UPDATE SET valid = ?
-            WHEN NOT MATCHED THEN 
-                INSERT (job_id, term_id, valid) VALUES (source.job_id, source.term_id, ?);
+            WHEN MATCHED AND target.valid <> @valid THEN
+                UPDATE SET valid = @valid
+            WHEN NOT MATCHED THEN
+                INSERT (job_id, term_id, valid) VALUES (source.job_id, source.term_id, @valid);
             """
 
-    GET_SEARCH_TERM_VALIDITIES_FROM_JOB = """
-                SELECT st.term_text, jst.valid
+    GET_ALL_SEARCH_TERM_VALIDITIES = """
+                SELECT j.job_number, st.term_text, jst.valid
                 FROM job_search_terms jst
+                JOIN jobs j ON jst.job_id = j.job_id
                 JOIN search_terms st ON jst.term_id = st.term_id
-                WHERE jst.job_id = ?
             """
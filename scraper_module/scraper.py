@@ -10,19 +10,24 @@ them as either valid or invalid. The results are saved to respective CSV files.
 import traceback
 import csv
 import re
+from collections import OrderedDict
 
 from .handlers import NetworkHandler
 from .models import JobData, LinkStatus
-from .config import JOB_SCRAPER_DEFAULT_URL, JOB_SCRAPER_REMOTE_URL
+from . import config
 
 USE_REMOTE = (
     False  # Set this constant to either True or False based on your requirements
 )
 
-if USE_REMOTE:
-    JOB_SCRAPER_URL = JOB_SCRAPER_REMOTE_URL
-else:
-    JOB_SCRAPER_URL = JOB_SCRAPER_DEFAULT_URL
+PAGE_CACHE_SIZE = 2000  # Maximum number of fetched pages kept in memory
+
+# Job age patterns for 'Posted xd ago' and 'Posted xh ago'
+DAYS_AGO_PATTERN = re.compile(r"(\d+)d")
+HOURS_AGO_PATTERN = re.compile(r"(\d+)h")
+
+# Default soup of a link whose page has not been downloaded yet
+NOT_FETCHED = object()
 
 
 class JobScraper:
@@ -39,35 +44,65 @@ class JobScraper:
         """
         self.last_request_time = 0
         self.time_since_last_request = 0
-        self.url = JOB_SCRAPER_URL
+        if USE_REMOTE:
+            self.url = config.JOB_SCRAPER_REMOTE_URL
+        else:
+            self.url = config.JOB_SCRAPER_DEFAULT_URL
         if load_network_handler:
             self.network_handler = NetworkHandler(self.url)
         else:
             self.network_handler = None
         self.job_data = JobData()
+        # Visible text and job age of recently fetched pages, keyed by URL, so a
+        # job found under several search terms is only downloaded once
+        self.page_cache = OrderedDict()
+        # Compiled regex for each search term, see get_search_term_pattern()
+        self.search_term_patterns = {}
 
-    def is_valid_link(self, search_term, url):
+    def is_valid_link(self, search_term, url, soup=NOT_FETCHED):
         """
         Validates if the provided URL's content contains the search term.
         The link is then categorized as valid or invalid. The validity status
         (boolean) is returned. Additionally, extracts 'job_age' from the webpage.
+        The page is fetched unless it is cached or an already downloaded soup
+        is provided. A soup of None means the page could not be fetched, in
+        which case the validity status is None.
         """
-        soup = self.network_handler.get_soup(url)
-        # Extract visible text from the soup object
-        visible_text = soup.get_text(separator=" ", strip=True).lower()
+        if url in self.page_cache:
+            self.page_cache.move_to_end(url)
+        else:
+            if soup is NOT_FETCHED:
+                soup = self.network_handler.get_soup(url)
+            if soup is None:
+                return None, None
+            # Extract visible text and 'job_age' from the soup object
+            self.page_cache[url] = (
+                soup.get_text(separator=" ", strip=True),
+                self.extract_job_age(soup),
+            )
+            if len(self.page_cache) > PAGE_CACHE_SIZE:
+                self.page_cache.popitem(last=False)
+        visible_text, job_age = self.page_cache[url]
 
-        # Prepare regex pattern for exact phrase match with word boundaries
-        pattern = rf"\b{re.escape(search_term.lower())}\b"
-        valid = bool(re.search(pattern, visible_text))
+        valid = bool(self.get_search_term_pattern(search_term).search(visible_text))
 
         if valid:
-            # Extract 'job_age'
-            job_age = self.extract_job_age(soup)
             return valid, job_age
         # If the search term is not found, return None for job_age
-        # don't need to launch extract_job_age() for invalid jobs
         return valid, None
 
+    def get_search_term_pattern(self, search_term):
+        """
+        Returns the compiled regex pattern for an exact phrase match of the
+        search term with word boundaries, ignoring case, compiling it on first
+        use.
+        """
+        if search_term not in self.search_term_patterns:
+            self.search_term_patterns[search_term] = re.compile(
+                rf"\b{re.escape(search_term)}\b", re.IGNORECASE
+            )
+        return self.search_term_patterns[search_term]
+
     def extract_job_age(self, soup):
         """
         Extracts the 'job_age' from the soup object.
@@ -75,23 +110,23 @@ class JobScraper:
         # Look for all span tags, and then filter out the one with 'Posted xd ago'
         spans = soup.find_all("span")
         for span in spans:
-            span_lower = span.text.lower()
+            span_text = span.text
+            span_lower = span_text.lower()
             if "posted" in span_lower:
                 if "d ago" in span_lower:
                     # Extract the number before 'd'
-                    match = re.search(r"(\d+)d", span.text)
+                    match = DAYS_AGO_PATTERN.search(span_text)
                     if match:
                         return int(match.group(1))
-                elif "h ago" in span.text.lower():
+                elif "h ago" in span_lower:
                     # Extract the number before 'h'
-                    match = re.search(r"(\d+)h", span.text)
+                    match = HOURS_AGO_PATTERN.search(span_text)
                     if match:
                         return 0  # 0 days ago
         return None
 
-    def process_link(self, link, search_term):
+    def process_link(self, url, search_term, soup=NOT_FETCHED):
         """Process an individual link to determine its validity and action."""
-        url = link.get_attribute("href").split("?")[0]
         job_number = self.job_data.extract_job_number_from_url(url)
         # link_status = self.job_data.job_in_links(job_number)
         #  for a given job_number, get the search terms and validities as a dict(search_term: validity)
@@ -105,7 +140,11 @@ class JobScraper:
             print("x", end="", flush=True)
             return
         # this search_term is not in the database for this job_number
-        valid, job_age = self.is_valid_link(search_term, url)
+        valid, job_age = self.is_valid_link(search_term, url, soup)
+        if valid is None:
+            # The page could not be fetched, leave the link for a later run
+            print("F", end="", flush=True)
+            return
 
         if job_age is not None:
             # calculate the job creation date
@@ -130,9 +169,28 @@ class JobScraper:
         Processes the current page, extracting job links and evaluating
         each link's validity based on the given search term.
         """
-        job_links = self.network_handler.find_job_links()
-        for link in job_links:
-            self.process_link(link, search_term)
+        # The same job is often linked more than once on a page
+        urls = list(
+            dict.fromkeys(
+                url.split("?")[0] for url in self.network_handler.find_job_urls()
+            )
+        )
+
+        # Download the pages that still need validating concurrently
+        soups = self.network_handler.get_soups(
+            url
+            for url in urls
+            if url not in self.page_cache
+            and search_term
+            not in self.job_data.get_search_terms_and_validities(
+                self.job_data.extract_job_number_from_url(url)
+            )
+        )
+        for url in urls:
+            self.process_link(url, search_term, soups.get(url, NOT_FETCHED))
+
+        # Save the page's links in one transaction
+        self.job_data.flush_links()
 
     def perform_searches(self, search_terms):
         """
@@ -214,6 +272,13 @@ class JobScraper:
                 # Save state before exiting
                 self.save_state(search_term, page_number)
 
+            # attempt to save any pending links
+            try:
+                self.job_data.flush_links()
+            except Exception as exception:  # pylint: disable=broad-except
+                print(f"Exception while trying to save pending links: {exception}")
+                traceback.print_exc()
+
             # attempt to close the database connection
             try:
                 print("Closing database connection...")
@@ -0,0 +1,228 @@
+"""
+test_handlers.py
+----------------
+
+Tests for NetworkHandler: backing off the URL read delay when the server is
+rate limiting, skipping pages that could not be fetched without ending the
+run, and waiting for the job links on the page to be replaced.
+"""
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import requests
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scraper_module.delays import DelaySettings
+from scraper_module.handlers import NetworkHandler
+from scraper_module.scraper import JobScraper
+
+JOB_URL = "https://url.for.job.search/job/123"
+
+
+def make_network_handler():
+    """
+    Return a NetworkHandler with the WebDriver mocked out.
+    """
+    with patch("scraper_module.handlers.webdriver.Chrome"), patch(
+        "scraper_module.handlers.WebDriverWait"
+    ), patch("builtins.print"):
+        return NetworkHandler("https://url.for.job.search/jobs")
+
+
+class RateLimitedResponseTest(unittest.TestCase):
+    """
+    Drives NetworkHandler.get_soup with a 429 response.
+    """
+
+    def setUp(self):
+        self.handler = make_network_handler()
+        self.handler.session.get = Mock(
+            return_value=Mock(status_code=429, content=b"")
+        )
+
+        with patch("scraper_module.scraper.config", Mock()), patch(
+            "scraper_module.scraper.JobData"
+        ):
+            self.scraper = JobScraper()
+        self.scraper.network_handler = self.handler
+        self.scraper.job_data.extract_job_number_from_url.return_value = 123
+        self.scraper.job_data.get_search_terms_and_validities.return_value = {}
+
+    def test_get_soup_backs_off(self):
+        """
+        A 429 response returns no soup and doubles the URL read delay.
+        """
+        url_read_delay = self.handler.url_read_delay
+        self.assertIsNone(self.handler.get_soup(JOB_URL))
+        self.assertEqual(self.handler.url_read_delay, url_read_delay * 2)
+
+    def test_process_link_skips_refused_page(self):
+        """
+        A refused page is fetched once and no validity is recorded.
+        """
+        with patch("builtins.print"):
+            self.scraper.process_link(JOB_URL, "python")
+        self.handler.session.get.assert_called_once()
+        self.scraper.job_data.add_or_update_link.assert_not_called()
+
+    def test_process_page_skips_refused_page(self):
+        """
+        A page refused while prefetching is not fetched again.
+        """
+        self.handler.find_job_urls = Mock(return_value=[JOB_URL])
+        with patch("builtins.print"):
+            self.scraper.process_page("python")
+        self.handler.session.get.assert_called_once()
+        self.scraper.job_data.add_or_update_link.assert_not_called()
+        self.scraper.job_data.flush_links.assert_called_once()
+
+    def test_process_page_skips_failed_download(self):
+        """
+        A page that fails to download while prefetching is skipped without
+        retrying the download again.
+        """
+        self.handler.session.get.side_effect = requests.ConnectionError
+        self.handler.find_job_urls = Mock(return_value=[JOB_URL])
+        with patch("builtins.print"), patch("scraper_module.handlers.time.sleep"):
+            self.scraper.process_page("python")
+        self.assertEqual(
+            self.handler.session.get.call_count, DelaySettings.NUM_RETRIES
+        )
+        self.scraper.job_data.add_or_update_link.assert_not_called()
+
+
+
+class UrlReadDelayTest(unittest.TestCase):
+    """
+    Checks that a backoff applies to a read that a worker is waiting for.
+    """
+
+    def setUp(self):
+        self.handler = make_network_handler()
+        self.handler.url_read_delay = 0.2
+
+    def test_backoff_delays_waiting_read(self):
+        """
+        A 429 received while another worker waits for its turn doubles that
+        worker's wait, without blocking on the waiting worker.
+        """
+        read_times = []
+        with patch("scraper_module.handlers.random.uniform", return_value=0):
+            start = time.monotonic()
+            self.handler.handle_successive_url_read_delay()
+            waiting_read = threading.Thread(
+                target=lambda: (
+                    self.handler.handle_successive_url_read_delay(),
+                    read_times.append(time.monotonic()),
+                )
+            )
+            waiting_read.start()
+            time.sleep(0.05)
+            self.handler.adjust_url_read_delay(429)
+            self.assertLess(time.monotonic() - start, 0.15)
+            waiting_read.join()
+        self.assertGreaterEqual(read_times[0] - start, 0.4)
+
+
+class RateLimitingServerTest(unittest.TestCase):
+    """
+    Drives NetworkHandler.get_soup through its requests session against a
+    local server that always responds with 429.
+    """
+
+    def setUp(self):
+        self.requests_received = 0
+        test = self
+
+        class RateLimitingRequestHandler(BaseHTTPRequestHandler):
+            """
+            Counts requests and responds to each with 429.
+            """
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """
+                Respond with 429 Too Many Requests.
+                """
+                test.requests_received += 1
+                self.send_response(429)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                """
+                Keep the test output quiet.
+                """
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RateLimitingRequestHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/job/123"
+        self.handler = make_network_handler()
+
+    def tearDown(self):
+        self.handler.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_429_is_not_retried_by_the_session(self):
+        """
+        A 429 response reaches get_soup after a single request, so the URL
+        read delay backs off before the next request.
+        """
+        url_read_delay = self.handler.url_read_delay
+        self.assertIsNone(self.handler.get_soup(self.url))
+        self.assertEqual(self.requests_received, 1)
+        self.assertEqual(self.handler.url_read_delay, url_read_delay * 2)
+
+
+
+class JobLinksReplacedTest(unittest.TestCase):
+    """
+    Checks that click_next_button and initiate_search only return once the
+    job links on the page have been replaced.
+    """
+
+    def setUp(self):
+        self.handler = make_network_handler()
+        self.handler.wait = WebDriverWait(
+            self.handler.driver, 0.2, poll_frequency=0.01
+        )
+
+    def test_new_job_links(self):
+        """
+        The click succeeds once the page shows different job links.
+        """
+        self.handler.driver.execute_script.side_effect = [
+            ["https://url.for.job.search/job/1"],
+            ["https://url.for.job.search/job/1"],
+            ["https://url.for.job.search/job/2"],
+        ]
+        self.assertTrue(self.handler.click_next_button())
+
+    def test_unchanged_job_links(self):
+        """
+        The click raises rather than succeeding when the page does not change.
+        """
+        self.handler.driver.execute_script.return_value = [
+            "https://url.for.job.search/job/1"
+        ]
+        with self.assertRaises(TimeoutException):
+            self.handler.click_next_button()
+
+    def test_search_unchanged_job_links(self):
+        """
+        A search raises rather than returning while the previous search's
+        job links are still shown.
+        """
+        self.handler.driver.execute_script.return_value = [
+            "https://url.for.job.search/job/1"
+        ]
+        with self.assertRaises(TimeoutException):
+            self.handler.initiate_search("python")
+
+
+if __name__ == "__main__":
+    unittest.main()